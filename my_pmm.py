@@ -1,7 +1,10 @@
 import logging
+import math
+from collections import deque
 from decimal import Decimal
 from typing import Dict, List
-import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
 from hummingbot.core.data_type.common import OrderType, PriceType, TradeType
 from hummingbot.core.data_type.order_candidate import OrderCandidate
 from hummingbot.core.event.events import OrderFilledEvent
@@ -9,7 +12,47 @@ from hummingbot.strategy.script_strategy_base import ScriptStrategyBase
 from hummingbot.data_feed.candles_feed.candles_factory import CandlesFactory, CandlesConfig
 from hummingbot.connector.connector_base import ConnectorBase
 import os
-import datetime
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(**kwargs):
+        return lambda f: f
+
+
+@njit(cache=True)
+def _rsi_natr_loop(close, high, low, n):
+    """
+    Wilder-smoothed RSI and NATR over the given price arrays.
+    Returns (rsi, natr, avg_gain, avg_loss, atr), the last three being the smoothing state at the final bar.
+    """
+    size = close.shape[0]
+    rsi = np.full(size, np.nan)
+    natr = np.full(size, np.nan)
+    avg_gain = 0.0
+    avg_loss = 0.0
+    atr = 0.0
+    if size <= n:
+        return rsi, natr, np.nan, np.nan, np.nan
+    for i in range(1, size):
+        change = close[i] - close[i - 1]
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        true_range = max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+        if i <= n:
+            # Seed with the simple average of the first n values
+            avg_gain += gain / n
+            avg_loss += loss / n
+            atr += true_range / n
+            if i < n:
+                continue
+        else:
+            avg_gain = (avg_gain * (n - 1) + gain) / n
+            avg_loss = (avg_loss * (n - 1) + loss) / n
+            atr = (atr * (n - 1) + true_range) / n
+        rsi[i] = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        natr[i] = atr / close[i] * 100.0
+    return rsi, natr, avg_gain, avg_loss, atr
 
 class MyPMM(ScriptStrategyBase):
     """
@@ -35,6 +78,10 @@ class MyPMM(ScriptStrategyBase):
     max_records = 1000
     # Number of candle rows to display in status
     display_rows = 5
+    # Number of most recent fills kept for the trade plot
+    max_trade_history = 100_000
+    # Minimum seconds between trade plot redraws
+    plot_interval = 5
 
     # Initializes candles
     candles = CandlesFactory.get_candle(CandlesConfig(connector=candle_exchange,
@@ -49,7 +96,29 @@ class MyPMM(ScriptStrategyBase):
     def __init__(self, connectors: Dict[str, ConnectorBase]):
         super().__init__(connectors)
         self.candles.start()
-        self.trade_history = []
+        self._conn = self.connectors[self.exchange]
+        self._order_amount_d = Decimal(str(self.order_amount))
+        self._base, self._quote = self.trading_pair.split("-")
+        # Fill history stored column-wise; side is 0 for BUY and 1 for SELL
+        self._ts = deque(maxlen=self.max_trade_history)
+        self._px = deque(maxlen=self.max_trade_history)
+        self._side = deque(maxlen=self.max_trade_history)
+        # Total fills seen, since the length of the capped history stops changing once it is full
+        self._fill_count = 0
+        # Trade plot figure, redrawn only when new fills arrive
+        self._fig = None
+        self._ax = None
+        self._last_plotted = 0
+        self._last_plot_ts = 0
+        self._plot_path = None
+        # (last candle timestamp, last close, buffer length, rows) -> status candles table, reused until the buffer changes
+        self._feat_cache = (None, None)
+        # Wilder smoothing state committed up to the last closed candle
+        self._rsi_state = None
+        # Quote key, inventory ratio and order count the resting orders were placed with
+        self._last_quote_key = None
+        self._last_inventory_ratio = None
+        self._last_order_count = 0
 
     # stop the candles when the script stops
     async def on_stop(self):
@@ -57,61 +126,164 @@ class MyPMM(ScriptStrategyBase):
 
     def on_tick(self):
         if self.create_timestamp <= self.current_timestamp:
+            ref_price = self._conn.get_price_by_type(self.trading_pair, self.price_source)
+            inventory_ratio = self.get_inventory_ratio(ref_price)
+            candles = self.candles._candles
+            # Forming candle's timestamp and close plus the price the quotes are built around
+            quote_key = (candles[-1][0], candles[-1][4], ref_price) if candles else None
+            # Keep the resting orders if nothing they were priced from moved and none of them filled or was dropped
+            if (quote_key is not None and quote_key == self._last_quote_key and
+                    abs(inventory_ratio - self._last_inventory_ratio) < 0.01 and
+                    len(self.get_active_orders(connector_name=self.exchange)) == self._last_order_count):
+                self.create_timestamp = self.order_refresh_time + self.current_timestamp
+                return
             self.cancel_all_orders()
-            proposal: List[OrderCandidate] = self.create_proposal()
+            proposal: List[OrderCandidate] = self.create_proposal(ref_price, inventory_ratio)
             proposal_adjusted: List[OrderCandidate] = self.adjust_proposal_to_budget(proposal)
             self.place_orders(proposal_adjusted)
+            # The budget checker zeroes the amount of candidates it cannot fund
+            self._last_order_count = sum(1 for order in proposal_adjusted if order.amount > 0)
+            self._last_quote_key = quote_key if self._last_order_count else None
+            self._last_inventory_ratio = inventory_ratio
             self.create_timestamp = self.order_refresh_time + self.current_timestamp
 
-    def get_candles_with_features(self):
-        candles_df = self.candles.candles_df
-        candles_df.ta.rsi(length=self.candles_length, append=True)
-        candles_df.ta.natr(length=self.candles_length, append=True)
+    def candles_array(self):
+        # Rows of the feed's buffer are [timestamp, open, high, low, close, volume, ...]
+        return np.asarray(self.candles._candles, dtype=np.float64)
+
+    def get_candles_with_features(self, rows: int):
+        """
+        Returns the last rows candles, newest first, with RSI and NATR columns.
+        """
+        candles = self.candles._candles
+        if not candles:
+            return pd.DataFrame(columns=self.candles.columns)
+        # The last candle is still forming, so its close is part of the key; the length catches history backfills
+        key = (candles[-1][0], candles[-1][4], len(candles), rows)
+        if self._feat_cache[0] == key:
+            return self._feat_cache[1]
+        arr = self.candles_array()
+        rsi, natr, _, _, _ = _rsi_natr_loop(arr[:, 4], arr[:, 2], arr[:, 3], self.candles_length)
+        # Reversed slices are numpy views, so the DataFrame below is the only copy
+        candles_df = pd.DataFrame(arr[-rows:][::-1], columns=self.candles.columns)
+        candles_df[f"RSI_{self.candles_length}"] = rsi[-rows:][::-1]
+        candles_df[f"NATR_{self.candles_length}"] = natr[-rows:][::-1]
+        self._feat_cache = (key, candles_df)
         return candles_df
 
-    def create_proposal(self) -> List[OrderCandidate]:
-        ref_price = self.connectors[self.exchange].get_price_by_type(self.trading_pair, self.price_source)
-        inventory_ratio = self.get_inventory_ratio()
-        candles_df = self.get_candles_with_features()
+    def update_indicators(self):
+        """
+        Folds candles that closed since the last tick into the RSI/NATR state and evaluates the forming candle on top of it.
+        Returns (rsi, rsi_prev, price, price_prev, natr), or None while there is not enough history to seed the state.
+        """
+        candles = self.candles._candles
+        state = self._rsi_state
+        new_rows = []
+        # Older history was backfilled in front of the candles the state was seeded from
+        if state is not None and candles and candles[0][0] < state["first_ts"]:
+            state = None
+        if state is not None:
+            # Walk back from the newest candle to the last committed one
+            for row in reversed(candles):
+                if row[0] <= state["last_ts"]:
+                    break
+                new_rows.append(row)
+            else:
+                # The last committed candle already left the buffer
+                state = None
+            new_rows.reverse()
+        if state is None:
+            state = self._rsi_state = self.warm_up_indicators()
+            if state is None:
+                return None
+            new_rows = [candles[-1]]
+
+        # Unpack rows into Python floats so the recurrence avoids numpy scalar arithmetic
+        for row in new_rows[:-1]:
+            state = self.wilder_step(state, float(row[4]), float(row[2]), float(row[3]))
+            state["last_ts"] = float(row[0])
+        self._rsi_state = state
+
+        last = new_rows[-1]
+        current = self.wilder_step(state, float(last[4]), float(last[2]), float(last[3]))
+        return current["rsi"], state["rsi"], current["close"], state["close"], current["natr"]
+
+    def warm_up_indicators(self):
+        # Seed the state from every closed candle; the forming one is handled by update_indicators
+        if len(self.candles._candles) < 2:
+            return None
+        arr = self.candles_array()
+        closed = arr[:-1]
+        rsi, natr, avg_gain, avg_loss, atr = _rsi_natr_loop(closed[:, 4], closed[:, 2], closed[:, 3],
+                                                            self.candles_length)
+        # Fewer than candles_length closed candles leave the averages NaN
+        if not (math.isfinite(avg_gain) and math.isfinite(avg_loss) and math.isfinite(atr)):
+            return None
+        return {"avg_gain": float(avg_gain), "avg_loss": float(avg_loss), "atr": float(atr),
+                "close": float(closed[-1, 4]), "rsi": float(rsi[-1]), "natr": float(natr[-1]),
+                "first_ts": float(arr[0, 0]), "last_ts": float(closed[-1, 0])}
+
+    def wilder_step(self, state, close, high, low):
+        # Wilder recurrence: avg = (prev * (n - 1) + x) / n
+        n = self.candles_length
+        prev_close = state["close"]
+        change = close - prev_close
+        true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        avg_gain = (state["avg_gain"] * (n - 1) + max(change, 0.0)) / n
+        avg_loss = (state["avg_loss"] * (n - 1) + max(-change, 0.0)) / n
+        atr = (state["atr"] * (n - 1) + true_range) / n
+        return {"avg_gain": avg_gain, "avg_loss": avg_loss, "atr": atr, "close": close,
+                "rsi": self.rsi_from_averages(avg_gain, avg_loss), "natr": atr / close * 100,
+                "first_ts": state["first_ts"], "last_ts": state["last_ts"]}
+
+    @staticmethod
+    def rsi_from_averages(avg_gain, avg_loss):
+        if avg_loss == 0:
+            return 100.0
+        return 100 - 100 / (1 + avg_gain / avg_loss)
 
-        rsi = candles_df["RSI_30"].iloc[-1]
-        rsi_prev = candles_df["RSI_30"].iloc[-2]
-        price = candles_df["close"].iloc[-1]
-        price_prev = candles_df["close"].iloc[-2]
-        natr = candles_df["NATR_30"].iloc[-1]
+    def create_proposal(self, ref_price: Decimal, inventory_ratio: float) -> List[OrderCandidate]:
+        indicators = self.update_indicators()
+        if indicators is None:
+            self.logger().info("Waiting for enough candles to compute RSI/NATR, not quoting.")
+            return []
+        rsi, rsi_prev, price, price_prev, natr = indicators
 
         # Initialize base spreads
-        spread_multiplier = Decimal(1 + (natr / 100))  # Volatility-adjusted spread
-        bid_spread = Decimal(self.bid_spread) * spread_multiplier
-        ask_spread = Decimal(self.ask_spread) * spread_multiplier
+        spread_multiplier = 1.0 + natr / 100.0  # Volatility-adjusted spread
+        bid_spread = self.bid_spread * spread_multiplier
+        ask_spread = self.ask_spread * spread_multiplier
 
         # Detect RSI divergence conditions
         bearish_divergence = rsi < rsi_prev and price > price_prev
         bullish_divergence = rsi > rsi_prev and price < price_prev
-        print(inventory_ratio)
+        self.logger().debug("inventory_ratio=%s", inventory_ratio)
         # Inventory-Aware Spread Skewing Logic
         if inventory_ratio > 0.7 and bearish_divergence:
-            ask_spread *= Decimal(0.9)
+            ask_spread *= 0.9
         elif inventory_ratio < 0.3 and bullish_divergence:
-            bid_spread *= Decimal(0.9)
+            bid_spread *= 0.9
 
-        buy_price = ref_price * Decimal(1 - bid_spread)
-        sell_price = ref_price * Decimal(1 + ask_spread)
+        # Spreads are computed in float; convert to Decimal only for the order prices
+        ref_price_f = float(ref_price)
+        buy_price = Decimal(str(ref_price_f * (1 - bid_spread)))
+        sell_price = Decimal(str(ref_price_f * (1 + ask_spread)))
 
         buy_order = OrderCandidate(trading_pair=self.trading_pair, is_maker=True, order_type=OrderType.LIMIT,
-                                   order_side=TradeType.BUY, amount=Decimal(self.order_amount), price=buy_price)
+                                   order_side=TradeType.BUY, amount=self._order_amount_d, price=buy_price)
 
         sell_order = OrderCandidate(trading_pair=self.trading_pair, is_maker=True, order_type=OrderType.LIMIT,
-                                    order_side=TradeType.SELL, amount=Decimal(self.order_amount), price=sell_price)
+                                    order_side=TradeType.SELL, amount=self._order_amount_d, price=sell_price)
 
         return [buy_order, sell_order]
 
     def adjust_proposal_to_budget(self, proposal: List[OrderCandidate]) -> List[OrderCandidate]:
-        proposal_adjusted = self.connectors[self.exchange].budget_checker.adjust_candidates(proposal, all_or_none=True)
+        proposal_adjusted = self._conn.budget_checker.adjust_candidates(proposal, all_or_none=True)
 
         return proposal_adjusted
 
     def place_orders(self, proposal: List[OrderCandidate]) -> None:
+        # buy/sell only schedule the request on the connector, so both orders are in flight concurrently
         for order in proposal:
             self.place_order(connector_name=self.exchange, order=order)
 
@@ -124,15 +296,15 @@ class MyPMM(ScriptStrategyBase):
                      order_type=order.order_type, price=order.price)
 
     def cancel_all_orders(self):
+        # cancel only schedules the request on the connector, so the cancels run concurrently
         for order in self.get_active_orders(connector_name=self.exchange):
             self.cancel(self.exchange, order.trading_pair, order.client_order_id)
 
     def did_fill_order(self, event: OrderFilledEvent):
-        self.trade_history.append({
-            "timestamp": self.current_timestamp,
-            "type": event.trade_type.name,
-            "price": event.price
-        })
+        self._ts.append(self.current_timestamp)
+        self._px.append(float(event.price))
+        self._side.append(0 if event.trade_type == TradeType.BUY else 1)
+        self._fill_count += 1
         msg = (f"{event.trade_type.name} {round(event.amount, 2)} {event.trading_pair} {self.exchange} at {round(event.price, 2)}")
         self.log_with_clock(logging.INFO, msg)
         self.notify_hb_app_with_timestamp(msg)
@@ -155,10 +327,9 @@ class MyPMM(ScriptStrategyBase):
             lines.extend(["", "  No active maker orders."])
 
         lines.extend(["\n----------------------------------------------------------------------\n"])
-        candles_df = self.get_candles_with_features()
         lines.extend([f"  Candles: {self.candles.name} | Interval: {self.candles.interval}", ""])
         # Only display the last display_rows number of rows
-        display_df = candles_df.tail(min(self.display_rows, self.candles_length)).iloc[::-1]
+        display_df = self.get_candles_with_features(min(self.display_rows, self.candles_length))
         lines.extend(["    " + line for line in display_df.to_string(index=False).split("\n")])
 
         plot_path = self.plot_candle_signals()
@@ -169,58 +340,57 @@ class MyPMM(ScriptStrategyBase):
 
         return "\n".join(lines)
 
-    def get_inventory_ratio(self) -> float:
-        base_asset, quote_asset = self.trading_pair.split("-")
-        base_balance = self.connectors[self.exchange].get_balance(base_asset)
-        quote_balance = self.connectors[self.exchange].get_balance(quote_asset)
+    def get_inventory_ratio(self, ref_price: Decimal) -> float:
+        base_balance = self._conn.get_balance(self._base)
+        quote_balance = self._conn.get_balance(self._quote)
 
-        price = self.connectors[self.exchange].get_price_by_type(self.trading_pair, PriceType.MidPrice)
-
-        base_value = base_balance * price
+        base_value = base_balance * ref_price
         total_value = base_value + quote_balance
         if total_value == 0:
             return 0.5  # Neutral
         return float(base_value / total_value)  # Between 0 (all quote) and 1 (all base)
     
     def plot_candle_signals(self, filename="strategy_plot.png"):
-        if not self.trade_history:
+        if not self._ts:
             return None
+        if self._plot_path and (self._fill_count == self._last_plotted or
+                                self.current_timestamp - self._last_plot_ts < self.plot_interval):
+            return self._plot_path
         
-        # Create figure and axis
-        plt.figure(figsize=(12, 6))
-        
-        # Extract timestamps and prices from trade history
-        buy_times = []
-        buy_prices = []
-        sell_times = []
-        sell_prices = []
+        # Create the figure on first use; a bare Figure renders with Agg and never touches a GUI backend
+        if self._fig is None:
+            from matplotlib.figure import Figure
+            self._fig = Figure(figsize=(12, 6))
+            self._ax = self._fig.subplots()
+        ax = self._ax
+        ax.cla()
         
-        for trade in self.trade_history:
-            if trade["type"] == "BUY":
-                buy_times.append(datetime.datetime.fromtimestamp(trade["timestamp"]))
-                buy_prices.append(float(trade["price"]))
-            elif trade["type"] == "SELL":
-                sell_times.append(datetime.datetime.fromtimestamp(trade["timestamp"]))
-                sell_prices.append(float(trade["price"]))
+        # Split trade history into buys and sells
+        times = pd.to_datetime(np.asarray(self._ts, dtype=np.float64), unit="s")
+        prices = np.asarray(self._px, dtype=np.float64)
+        buy_mask = np.asarray(self._side) == 0
+        sell_mask = ~buy_mask
         
         # Plot trades
-        if buy_times:
-            plt.scatter(buy_times, buy_prices, color='green', label='Buy', marker='^', s=100)
-        if sell_times:
-            plt.scatter(sell_times, sell_prices, color='red', label='Sell', marker='v', s=100)
+        if buy_mask.any():
+            ax.scatter(times[buy_mask], prices[buy_mask], color='green', label='Buy', marker='^', s=100)
+        if sell_mask.any():
+            ax.scatter(times[sell_mask], prices[sell_mask], color='red', label='Sell', marker='v', s=100)
         
         # Add labels and title
-        plt.xlabel('Time')
-        plt.ylabel('Price')
-        plt.title(f'Trade History for {self.trading_pair}')
-        plt.xticks(rotation=45)
-        plt.grid(True, alpha=0.3)
-        plt.legend()
-        plt.tight_layout()
+        ax.set_xlabel('Time (UTC)')
+        ax.set_ylabel('Price')
+        ax.set_title(f'Trade History for {self.trading_pair}')
+        ax.tick_params(axis='x', labelrotation=45)
+        ax.grid(True, alpha=0.3)
+        ax.legend()
+        self._fig.tight_layout()
         
         # Save the figure
         save_path = os.path.join(os.getcwd(), filename)
-        plt.savefig(save_path)
-        plt.close()
+        self._fig.savefig(save_path)
+        self._last_plotted = self._fill_count
+        self._last_plot_ts = self.current_timestamp
+        self._plot_path = save_path
         
         return save_path